@@ -1,16 +1,32 @@
 import cv2
+import numpy as np
+import torch
+from numba import njit, prange
 from ultralytics import YOLO
 import smtplib
 from email.mime.multipart import MIMEMultipart
 from email.mime.text import MIMEText
 import datetime
-import pytz
+from zoneinfo import ZoneInfo
 from email.mime.image import MIMEImage
-import matplotlib.pyplot as plt
-import io
+from email.mime.base import MIMEBase
+from email import encoders
 import pymysql
 import time
 import json
+import gc
+import queue
+import threading
+import tempfile
+import os
+import math
+
+try:
+    from turbojpeg import TurboJPEG, TJPF_BGR
+    _JPEG = TurboJPEG()
+except (ImportError, RuntimeError, OSError):
+    # PyTurboJPEG or the libjpeg-turbo library is not installed; fall back to cv2.imencode
+    _JPEG = None
 
 
 def load_config():
@@ -29,6 +45,99 @@ def load_config():
     return config
 
 
+# Loaded once at start-up and shared by every frame, instead of re-reading the
+# config and re-initialising the YOLO weights on each prediction.
+_CONFIG = load_config()
+_MODEL = YOLO(_CONFIG["model_weights_path"])
+_INTRUDER_ID = {name: class_id for class_id, name in _MODEL.names.items()}['Intruder']
+_TZ = ZoneInfo('Asia/Kolkata')
+
+# Model input size, the same as used in training, and the largest number of frames sent to the model at once
+_INPUT_SIZE = 416
+_BATCH_SIZE = 4
+# (_BATCH_SIZE, 3, 416, 416) float32 model input, allocated for the first frame shape seen and reused; see model_predict()
+_INPUT = None
+_INPUT_FRAME_SHAPE = None
+# Letterbox-resized frame for each slot of the model input, reused across calls
+_RESIZED = [None] * _BATCH_SIZE
+
+# SMTP session and database connection, opened on the first alert and reused.
+_SMTP = None
+_DB = None
+
+_INSERT_SQL = """INSERT INTO intruder_log (image, captured_time) VALUES (%s, %s)"""
+
+# Pending (image, clip, timestamp) alerts handed from the capture loop to alert_worker()
+alert_queue = queue.Queue(maxsize=8)
+# Highest rate at which frames are sampled into the alert clip
+_CLIP_FPS = 10
+# Alert clip ring arrays not in use by the capture loop, handed back by alert_worker() once a clip is encoded
+clip_rings = queue.Queue()
+
+
+def open_video(config):
+    """
+    Opens the video stream, using hardware decoding through GStreamer when it is enabled and available.
+
+    Args:
+        config: The configuration dictionary with the video settings.
+
+    Returns:
+        A tuple of the opened cv2.VideoCapture and a flag that is True when it delivers NV12 frames instead of BGR.
+
+    Raises:
+        None
+
+    Description:
+        When 'use_gstreamer' is set, the MJPEG stream from the IPWebcam App is fetched with souphttpsrc and decoded by
+        the NVIDIA hardware decoder (nvv4l2decoder). The decoder's native NV12 output is copied to the appsink as-is,
+        with no colour conversion in the pipeline; see nv12_to_bgr(). The appsink keeps only the latest frame and drops
+        older ones, so no stale frames build up between reads.
+
+        If GStreamer is disabled, or OpenCV cannot open the pipeline (no GStreamer support or no NVIDIA decoder), the
+        plain cv2.VideoCapture on the URL is used. A one-frame buffer is requested, but backends such as FFmpeg (used
+        for HTTP URLs) ignore it, which is why video_capture() drains stale frames after an alert on this path.
+    """
+    if config["use_gstreamer"]:
+        pipeline = (
+            f'souphttpsrc location={config["video_url"]} is-live=true ! multipartdemux ! image/jpeg ! '
+            'nvv4l2decoder mjpeg=1 ! nvvideoconvert ! video/x-raw,format=NV12 ! appsink drop=1 max-buffers=1'
+        )
+        video = cv2.VideoCapture(pipeline, cv2.CAP_GSTREAMER)
+        if video.isOpened():
+            return video, True
+        print("GStreamer pipeline could not be opened, falling back to the default video capture.")
+
+    video = cv2.VideoCapture(config["video_url"])
+    video.set(cv2.CAP_PROP_BUFFERSIZE, 1)
+    return video, False
+
+
+def nv12_to_bgr(nv12, out):
+    """
+    Converts an NV12 frame to BGR into a pre-allocated buffer.
+
+    Args:
+        nv12: The NV12 frame as read from the capture, a single-channel array of height * 3/2 rows.
+        out: The BGR buffer to write into, or None to allocate it on the first call.
+
+    Returns:
+        The BGR frame (the same array as out when out was given).
+
+    Raises:
+        None
+
+    Description:
+        The NV12 array, with its Y plane followed by the interleaved UV plane, is converted with cv2.cvtColor straight
+        into the output buffer, so a frame is converted in a single pass and no new array is allocated once the buffer
+        exists.
+    """
+    height = nv12.shape[0] * 2 // 3
+    if out is None:
+        out = np.empty((height, nv12.shape[1], 3), dtype=np.uint8)
+    return cv2.cvtColor(nv12, cv2.COLOR_YUV2BGR_NV12, dst=out)
+
+
 def video_capture():
     """
     Captures video frames from the IPWebcam Android App connected to the internet using NGROK and performs object detection (YOLO) on each frame.
@@ -40,97 +149,487 @@ def video_capture():
         None
 
     Description:
-        The function continuously captures frames and sends them to model_predict(). If an intruder is
-        detected, a mail alert is triggered, the image and timestamp are recorded in the database, and the loop breaks.
+        The function continuously captures frames from a single VideoCapture, decoding them into buffers that are
+        allocated once and reused, and sends them to model_predict() in small batches (up to batch_size frames or
+        batch_window seconds, whichever comes first). If an intruder is detected, a mail alert is triggered, the image
+        and timestamp are recorded in the database, and the loop pauses for the alert delay.
+
+        Frames whose small grayscale thumbnail differs from that of the last processed frame by less than
+        'motion_threshold' (mean absolute difference in gray levels) are skipped without running the model.
+
+        Captured frames are sampled at clip_fps and a 480-pixel-wide copy is kept in a ring array allocated once, so
+        the last 'alert_clip_seconds' can be sent with the alert as a short video clip (0 disables the clip). On an
+        alert, the filled ring itself is handed to alert_worker() and recording continues into a spare ring, so the
+        frames are never copied; if no spare ring is free, the alert is sent without a clip.
+
+        The mail alert, clip encoding and database entry are handed to alert_worker() through alert_queue, so the
+        capture loop does not wait on them. If the queue is full, the alert is dropped.
+
+        The time delay helps prevent the model from identifying the same intruder multiple times. On the plain
+        VideoCapture, frames queued by the camera during the delay are discarded so detection resumes on a live frame.
+
+        If a frame cannot be read (for example when the NGROK tunnel or the IPWebcam App drops), the capture is
+        released and reopened after the same delay, so the function keeps running until it is interrupted.
+    """
+    config = _CONFIG
+    threading.Thread(target=alert_worker, args=(config,), daemon=True).start()
+
+    video, nv12 = open_video(config)
+
+    delay_time = 30
+    drain_frames = 30
+    gc_interval = 500
+    batch_size = _BATCH_SIZE
+    batch_window = 0.033
+    frame_count = 0
+    # One BGR buffer per batch slot, reused across batches instead of allocating every frame
+    bgr_buffers = [None] * batch_size
+    nv12_buffer = None
+    motion_threshold = config["motion_threshold"]
+    previous_thumbnail = None
+    spare_thumbnail = None
+    # Ring of downscaled frames for the alert clip, sampled at no more than clip_fps; allocated with a spare on the
+    # first frame, once the frame size is known
+    clip_fps = _CLIP_FPS
+    clip_length = math.ceil(config["alert_clip_seconds"] * clip_fps)
+    clip_ring = None
+    clip_times = [0.0] * clip_length
+    clip_count = 0
+    clip_size = None
+
+    try:
+        while True:
+            # Collect up to batch_size frames, or whatever arrives within batch_window seconds
+            frames = []
+            deadline = time.monotonic() + batch_window
+            while len(frames) < batch_size and (not frames or time.monotonic() < deadline):
+                slot = len(frames)
+                ret = video.grab()
+                if ret:
+                    if nv12:
+                        ret, nv12_buffer = video.retrieve(nv12_buffer)
+                        if ret:
+                            bgr_buffers[slot] = nv12_to_bgr(nv12_buffer, bgr_buffers[slot])
+                    else:
+                        ret, bgr_buffers[slot] = video.retrieve(bgr_buffers[slot])
+
+                if not ret:
+                    break
+
+                frame = bgr_buffers[slot]
+
+                # Keep a downscaled copy of a frame for the alert clip at most clip_fps times a second; when one is
+                # taken, the motion thumbnail is built from it, so the frame is only resized once at full resolution
+                small_frame = frame
+                now = time.monotonic()
+                if clip_length and (clip_count == 0
+                                    or now - clip_times[(clip_count - 1) % clip_length] >= 1 / clip_fps):
+                    if clip_ring is None:
+                        clip_size = (480, round(frame.shape[0] * 480 / frame.shape[1] / 2) * 2)
+                        clip_ring = np.empty((clip_length, clip_size[1], clip_size[0], 3), dtype=np.uint8)
+                        clip_rings.put(np.empty_like(clip_ring))
+                    index = clip_count % clip_length
+                    cv2.resize(frame, clip_size, dst=clip_ring[index], interpolation=cv2.INTER_AREA)
+                    clip_times[index] = now
+                    clip_count += 1
+                    small_frame = clip_ring[index]
+
+                # Skip frames that barely differ from the last frame sent to the model
+                # (the two thumbnail buffers are swapped rather than reallocated)
+                thumbnail = motion_thumbnail(small_frame, spare_thumbnail)
+                if (previous_thumbnail is not None
+                        and cv2.absdiff(thumbnail, previous_thumbnail).mean() < motion_threshold):
+                    spare_thumbnail = thumbnail
+                    continue
+                spare_thumbnail, previous_thumbnail = previous_thumbnail, thumbnail
+
+                frames.append(frame)
+
+            if not ret:
+                print("Error in accessing the video capture. Please check the camera. Reconnecting in",
+                      delay_time, "seconds.")
+                video.release()
+                time.sleep(delay_time)
+                video, nv12 = open_video(config)
+                previous_thumbnail = None
+                clip_count = 0
+                continue
+
+            frame_count += len(frames)
+            if frame_count % gc_interval < len(frames):
+                gc.collect()
+
+            detections = model_predict(frames)
+
+            intruder_frame = None
+            for frame, detected_objects in zip(frames, detections):
+                for detected_object in detected_objects:
+                    class_name = detected_object['class']
+                    coordinates = detected_object['coordinates']
+                    probability = detected_object['probability']
+
+                    if class_name == 'Intruder' and probability > 0.5:
+                        intruder_frame = frame
+                        break
+                if intruder_frame is not None:
+                    break
+
+            if intruder_frame is not None:
+                # Encode the frame once; the same JPEG bytes are mailed and logged
+                image_data = encode_jpeg(intruder_frame)
+                clip = None
+                if clip_count:
+                    try:
+                        clip = (clip_ring, list(clip_times), clip_count)
+                        clip_ring = clip_rings.get_nowait()
+                    except queue.Empty:
+                        # The worker still holds the spare ring; keep recording into this one
+                        clip = None
+                        print("No free clip buffer, sending the alert without a clip")
+                timestamp = datetime.datetime.now(_TZ).strftime('%Y-%m-%d %H:%M:%S')
+                try:
+                    alert_queue.put_nowait((image_data, clip, timestamp))
+                except queue.Full:
+                    print("Alert queue is full, dropping alert at", timestamp)
+
+                time.sleep(delay_time)
+
+                # Discard the frames that queued up while sleeping; the GStreamer appsink already drops them
+                if not nv12:
+                    for _ in range(drain_frames):
+                        video.grab()
+
+                # Always check the first frame after the delay, even if the scene has not changed,
+                # and start the next clip from frames captured after it
+                previous_thumbnail = None
+                clip_count = 0
+    finally:
+        video.release()
+
+        # Let the worker finish any alerts still waiting in the queue
+        alert_queue.join()
+
+
+def motion_thumbnail(frame, out):
+    """
+    Returns a small grayscale copy of a frame for motion detection.
+
+    Args:
+        frame: The BGR frame, or a downscaled copy of it.
+        out: The grayscale buffer to write into, or None to allocate it.
+
+    Returns:
+        A 160x90 grayscale image (the same array as out when out was given).
+
+    Raises:
+        None
+
+    Description:
+        The frame is shrunk before the grayscale conversion, so comparing two frames costs a few kilobytes of work
+        instead of a full-resolution pass. The conversion writes straight into the given buffer instead of allocating
+        a new image.
+    """
+    small = cv2.resize(frame, (160, 90), interpolation=cv2.INTER_AREA)
+    return cv2.cvtColor(small, cv2.COLOR_BGR2GRAY, dst=out)
 
-        The time delay helps prevent the model from identifying the same intruder multiple times, and the self-recursive call ensures that object detection continues after the loop breaks.
+
+def clip_snapshot(ring, times, count, seconds, max_fps):
     """
-    config = load_config()
-    video = cv2.VideoCapture(config["video_url"])
+    Returns the last seconds of frames held in an alert clip ring, oldest first.
 
-    while True:
-        ret, frame = video.read()
+    Args:
+        ring: The ring array of downscaled frames.
+        times: The capture time of each frame in the ring, from time.monotonic().
+        count: The number of frames written to the ring so far.
+        seconds: The length of the clip in seconds.
+        max_fps: The highest rate the frames were sampled at.
+
+    Returns:
+        A tuple of the list of frames, as views of the ring, and the frame rate they were captured at.
+
+    Raises:
+        None
 
-        if not ret:
-            print("Error in accessing the video capture. Please check the camera.")
-            break
+    Description:
+        Only the frames captured within the given seconds of the newest frame are kept, since the ring can hold a
+        longer span when the loop runs slower than the sampling rate. The frame rate is measured from the capture
+        times, since frames are captured only as fast as the loop runs, then rounded and kept between 1 and max_fps
+        so the encoder gets a valid time base.
+    """
+    length = min(count, len(ring))
+    order = [(count - length + offset) % len(ring) for offset in range(length)]
+    newest = times[order[-1]]
+    order = [index for index in order if newest - times[index] <= seconds]
 
-        frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        _, image_data = cv2.imencode(".jpg", frame)
-        detected_objects = model_predict(image_data)
+    duration = newest - times[order[0]]
+    fps = (len(order) - 1) / duration if len(order) > 1 and duration > 0 else 1
+    fps = max(1, min(max_fps, round(fps)))
+    return [ring[index] for index in order], fps
 
-        for detected_object in detected_objects:
-            class_name = detected_object['class']
-            coordinates = detected_object['coordinates']
-            probability = detected_object['probability']
 
-            if class_name == 'Intruder' and probability > 0.5:
-                timestamp = datetime.datetime.now(pytz.timezone('Asia/Kolkata')).strftime('%Y-%m-%d %H:%M:%S')
-                mail_trigger(image_data, timestamp, config)
+def encode_clip(frames, fps, config):
+    """
+    Encodes the alert clip frames as an MP4 video.
+
+    Args:
+        frames: The clip frames as a sequence of equally sized BGR arrays, oldest first.
+        fps: The frame rate of the clip.
+        config: The configuration dictionary with the video settings.
+
+    Returns:
+        The MP4 video as bytes.
+
+    Raises:
+        OSError: If the video could not be written.
+
+    Description:
+        When 'use_gstreamer' is set, the clip is encoded by the NVIDIA hardware encoder (nvv4l2h264enc) through a
+        GStreamer pipeline as H.264, so encoding costs almost no CPU. Otherwise, or if the pipeline cannot be opened,
+        OpenCV's software MPEG-4 Part 2 ('mp4v') encoder is used. The video is written to a temporary file and read
+        back as bytes.
+    """
+    height, width = frames[0].shape[:2]
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "clip.mp4")
+
+        writer = None
+        if config["use_gstreamer"]:
+            pipeline = (
+                'appsrc ! video/x-raw,format=BGR ! videoconvert ! video/x-raw,format=BGRx ! nvvideoconvert ! '
+                'video/x-raw(memory:NVMM),format=NV12 ! nvv4l2h264enc ! h264parse ! qtmux ! '
+                f'filesink location={path}'
+            )
+            writer = cv2.VideoWriter(pipeline, cv2.CAP_GSTREAMER, 0, fps, (width, height), True)
+            if not writer.isOpened():
+                writer = None
+        if writer is None:
+            writer = cv2.VideoWriter(path, cv2.VideoWriter_fourcc(*'mp4v'), fps, (width, height))
+            if not writer.isOpened():
+                raise OSError("Could not open a video writer for the alert clip")
+
+        for frame in frames:
+            writer.write(frame)
+        writer.release()
+
+        with open(path, 'rb') as clip_file:
+            return clip_file.read()
+
+
+def encode_jpeg(frame):
+    """
+    Encodes a BGR frame as JPEG.
+
+    Args:
+        frame: The BGR frame to encode.
+
+    Returns:
+        The JPEG image as bytes.
+
+    Raises:
+        None
+
+    Description:
+        The frame is encoded with libjpeg-turbo through PyTurboJPEG, which uses SIMD for the colour conversion and DCT.
+        If PyTurboJPEG is not available, cv2.imencode is used instead.
+    """
+    if _JPEG is not None:
+        return _JPEG.encode(frame, quality=85, pixel_format=TJPF_BGR)
+    return cv2.imencode(".jpg", frame)[1].tobytes()
+
+
+def alert_worker(config):
+    """
+    Sends the alerts queued by video_capture() in a background thread.
+
+    Args:
+        config: The configuration dictionary passed to mail_trigger() and database_entry().
+
+    Returns:
+        None
+
+    Raises:
+        None
+
+    Description:
+        The function runs forever, taking (image, clip, timestamp) entries from alert_queue. The clip, if any, is a
+        (ring, times, count) tuple; its last 'alert_clip_seconds' are taken with clip_snapshot() and encoded with
+        encode_clip(), and the ring is then returned to clip_rings for the capture loop to reuse. The image and clip
+        are passed to mail_trigger() and the image to database_entry(). Any failure is printed so the worker keeps
+        serving later alerts, and every alert is marked done in alert_queue.
+    """
+    while True:
+        image_data, clip, timestamp = alert_queue.get()
+        try:
+            clip_data = None
+            if clip is not None:
+                ring, times, count = clip
+                try:
+                    frames, fps = clip_snapshot(ring, times, count, config["alert_clip_seconds"], _CLIP_FPS)
+                    clip_data = encode_clip(frames, fps, config)
+                except Exception as e:
+                    print("Failed to encode alert clip:", str(e))
+                finally:
+                    clip_rings.put(ring)
+            mail_trigger(image_data, timestamp, config, clip_data)
+            try:
                 database_entry(image_data, timestamp, config)
-        break
+            except Exception as e:
+                print("Failed to log intrusion:", str(e))
+        except Exception as e:
+            print("Failed to handle alert:", str(e))
+        finally:
+            # Always mark the alert done, so alert_queue.join() in video_capture() cannot hang
+            alert_queue.task_done()
 
-    delay_time = 30
-    time.sleep(delay_time)
 
-    video_capture()
+@njit(parallel=True, fastmath=True, cache=True)
+def preprocess(bgr, out, top, left):
+    """
+    Writes a resized BGR frame into a model input tensor as normalised RGB, channels first.
 
+    Args:
+        bgr: The frame resized to fit the model input, as a uint8 BGR array.
+        out: The (3, 416, 416) float32 slice of the model input to write into.
+        top: The row of out at which the frame starts.
+        left: The column of out at which the frame starts.
 
-def model_predict(image):
+    Returns:
+        None
+
+    Raises:
+        None
+
+    Description:
+        The BGR to RGB swap, the scaling to 0-1 and the HWC to CHW transpose are done in a single pass over the frame,
+        compiled by Numba and run in parallel over the rows. The padding around the frame is left untouched.
     """
-    Performs object detection using a trained YOLO model on the given image.
+    height, width = bgr.shape[0], bgr.shape[1]
+    for y in prange(height):
+        for x in range(width):
+            out[0, top + y, left + x] = bgr[y, x, 2] / 255.0
+            out[1, top + y, left + x] = bgr[y, x, 1] / 255.0
+            out[2, top + y, left + x] = bgr[y, x, 0] / 255.0
+
+
+def model_predict(frames):
+    """
+    Performs object detection using a trained YOLO model on a batch of frames.
 
     Args:
-        image: The input image on which object detection will be performed.
+        frames: The list of input frames on which object detection will be performed, at most _BATCH_SIZE of them.
 
     Returns:
-        List of dictionaries containing the class name, coordinates, and probability for each detected object.
+        A list with one entry per frame, each a list of dictionaries containing the class name, coordinates, and
+        probability for each detected object.
 
     Raises:
         None
 
     Description:
-        This function uses a pre-trained YOLO model to perform object detection on the given image.
+        Each frame is letterboxed to 416x416 (resized with its aspect ratio kept and padded with gray, as Ultralytics
+        does) and converted by preprocess() into a model input tensor. The resized frames and the tensor are allocated
+        once for the camera's frame size and reused. The tensor is passed to the model as it is, so Ultralytics skips
+        its letterbox and input conversion. It still converts the tensor back to 416x416 uint8 images for its Results
+        (orig_img) on every call, which costs a float to uint8 pass and a transpose over the batch. This path has not
+        been benchmarked against passing the BGR frames to predict() directly.
+
+        This function uses the pre-trained YOLO model loaded once at start-up to perform object detection on the
+        frames in a single predict() call, at the same image size the model was trained with, in half precision on the
+        device set in the config file. The model keeps its predictor between calls.
+
+        The 'Intruder' class and the 0.5 probability threshold are passed to the model, so other boxes are dropped
+        before non-maximum suppression. The coordinates and probabilities of the remaining boxes are copied to the CPU
+        as whole arrays, rather than one value per box, mapped back from the letterbox to the frame, and added to that
+        frame's result list.
+
+        Each dictionary represents a detected object and includes the following keys: 'class', 'coordinates',
+        'probability'.
+
+        If no 'Intruder' is detected with a probability above the threshold in a frame, that frame's list is empty.
+    """
+    global _INPUT, _INPUT_FRAME_SHAPE
+
+    # The camera resolution is fixed, so the letterbox geometry only depends on the first frame
+    height, width = frames[0].shape[:2]
+    scale = min(_INPUT_SIZE / height, _INPUT_SIZE / width)
+    resized_width, resized_height = round(width * scale), round(height * scale)
+    top, left = (_INPUT_SIZE - resized_height) // 2, (_INPUT_SIZE - resized_width) // 2
+
+    if _INPUT is None or _INPUT_FRAME_SHAPE != frames[0].shape:
+        _INPUT = np.full((_BATCH_SIZE, 3, _INPUT_SIZE, _INPUT_SIZE), 114 / 255, dtype=np.float32)
+        _INPUT_FRAME_SHAPE = frames[0].shape
+
+    for index, frame in enumerate(frames):
+        _RESIZED[index] = cv2.resize(frame, (resized_width, resized_height), dst=_RESIZED[index],
+                                     interpolation=cv2.INTER_LINEAR)
+        preprocess(_RESIZED[index], _INPUT[index], top, left)
+
+    predictions = _MODEL.predict(torch.from_numpy(_INPUT[:len(frames)]), imgsz=_INPUT_SIZE, conf=0.5,
+                                 classes=[_INTRUDER_ID], half=True, device=_CONFIG["device"], verbose=False)
+    detections = []
+    for prediction in predictions:
+        boxes = prediction.boxes
+        coordinates = (boxes.xyxy.cpu().numpy() - [left, top, left, top]) / scale
+        coordinates = coordinates.clip(0, [width, height, width, height]).round().astype(int)
+        probabilities = boxes.conf.cpu().numpy()
+
+        detected_objects = []
+        for box_coordinates, probability in zip(coordinates, probabilities):
+            detected_object = {
+                'class': 'Intruder',
+                'coordinates': box_coordinates.tolist(),
+                'probability': round(float(probability), 2)
+            }
+            detected_objects.append(detected_object)
+        detections.append(detected_objects)
+
+    return detections
+
+
+def get_smtp(config):
+    """
+    Returns the shared SMTP session, opening (or re-opening) it when needed.
+
+    Args:
+        config: The configuration dictionary with the SMTP settings.
 
-        The function obtains predictions from the model and iterates over the bounding boxes. For each bounding box,
-        it extracts the class name, coordinates, and probability. If the class name is 'Intruder' and the probability
-        is greater than 0.5, it adds the object information to the result list.
+    Returns:
+        An authenticated smtplib.SMTP session.
 
-        The function returns a list of dictionaries, where each dictionary represents a detected object and includes the
-        following keys: 'class', 'coordinates', 'probability'.
+    Raises:
+        smtplib.SMTPException: If the connection or login fails.
 
-        If no 'Intruder' is detected with a probability above the threshold, the function returns an empty list.
+    Description:
+        The TLS handshake and login are done once and the session is kept open between alerts. Before it is reused,
+        a NOOP checks that the server has not dropped the connection; if it has, the old session is closed and a new
+        one is opened. Socket operations time out after 30 seconds, so a stuck server cannot block alert_worker().
     """
-    config = load_config()
-    best_model = YOLO(config["model_weights_path"])
-    predictions = best_model.predict(image)
-    detected_objects = []
-    if len(predictions) > 0:
-        prediction = predictions[0]
-        for box in prediction.boxes:
-            class_name = prediction.names[box.cls[0].item()]
-            coordinates = box.xyxy[0].tolist()
-            coordinates = [round(x) for x in coordinates]
-            probability = round(box.conf[0].item(), 2)
-            print("probability:", probability)
-            if class_name == 'Intruder' and probability > 0.5:
-                detected_object = {
-                    'class': class_name,
-                    'coordinates': coordinates,
-                    'probability': probability
-                }
-                detected_objects.append(detected_object)
+    global _SMTP
 
-    return detected_objects
+    if _SMTP is not None:
+        try:
+            if _SMTP.noop()[0] == 250:
+                return _SMTP
+        except smtplib.SMTPServerDisconnected:
+            pass
+        # Close the old socket before it is replaced
+        _SMTP.close()
 
+    _SMTP = smtplib.SMTP(config["smtp_server"], config["smtp_port"], timeout=30)
+    _SMTP.starttls()
+    _SMTP.login(config["sender_email"], config["sender_password"])
+    return _SMTP
 
-def mail_trigger(image, timestamp, config):
+
+def mail_trigger(image, timestamp, config, clip=None):
     """
-    Sends an email alert with an attached image and timestamp information.
+    Sends an email alert with an attached image, an optional video clip and timestamp information.
 
     Args:
-      image: The image to be attached to the email.
+      image: The JPEG image bytes to be attached to the email.
       timestamp: The timestamp indicating the occurrence of the event.
+      clip: The MP4 video bytes of the moments before the alert, or None to send the image only.
 
     Returns:
       None
@@ -141,18 +640,17 @@ def mail_trigger(image, timestamp, config):
     Description: This function triggers an email alert to notify the control room about an intrusion event. It constructs an email message with the provided image as an attachment and includes the timestamp information in the
   subject and body of the email.
 
-      The function uses the specified sender email address, password, SMTP server, and port to establish a connection.
-      It creates a multipart message and attaches the image to the email.
+      The function uses the shared SMTP session from get_smtp(), which is connected with the specified sender email address, password, SMTP server, and port.
+      It creates a multipart message and attaches the JPEG bytes, and the video clip if there is one, to the email as they are.
       Additionally, it includes a text message in the email body to provide context about the intrusion event.
 
-      The email is sent using the established SMTP connection.
+      The email is sent using the established SMTP connection, which is kept open for the next alert.
       If the email is sent successfully, a success message is printed.
       If any error occurs during the email sending process, an error message is printed.
   """
+    global _SMTP
+
     sender_email = config["sender_email"]
-    sender_password = config["sender_password"]
-    smtp_server = config["smtp_server"]
-    smtp_port = config["smtp_port"]
     recipient_email = config["recipient_email"]
 
     # Change the format to include in the Subject of the e-mail
@@ -165,40 +663,78 @@ def mail_trigger(image, timestamp, config):
     message["To"] = recipient_email
     message["Subject"] = '*Intruder Alert' + ' : ' + timestamp + ' ' + 'Hours*'
 
-    plt.imshow(image)
-    plt.axis('off')
-
-    image_io = io.BytesIO()
-    plt.savefig(image_io, format='jpeg')
-    image_io.seek(0)
-
     # Attach the image
-    image = MIMEImage(image_io.getvalue(), _subtype='jpeg')
+    image = MIMEImage(image, _subtype='jpeg')
     image.add_header("Content-Disposition", "attachment", filename="image.jpg")
     message.attach(image)
 
+    # Attach the video clip
+    if clip is not None:
+        video = MIMEBase('video', 'mp4')
+        video.set_payload(clip)
+        encoders.encode_base64(video)
+        video.add_header("Content-Disposition", "attachment", filename="clip.mp4")
+        message.attach(video)
+
     text = MIMEText(
         "Dear Control Room, \n This is to keep you informed that an intruder has entered the campus at" + " " + timestamp + " " + "Hours")
     message.attach(text)
 
     # Send the email
     try:
-        server = smtplib.SMTP(smtp_server, smtp_port)
-        server.starttls()
-        server.login(sender_email, sender_password)
-        server.send_message(message)
-        server.quit()
+        get_smtp(config).send_message(message)
         print("Email sent successfully")
     except Exception as e:
+        # Force a fresh session on the next alert
+        if _SMTP is not None:
+            _SMTP.close()
+        _SMTP = None
         print("Failed to send email:", str(e))
 
 
+def get_db(config):
+    """
+    Returns the shared database connection, opening (or re-opening) it when needed.
+
+    Args:
+        config: The configuration dictionary with the database settings.
+
+    Returns:
+        A pymysql connection in autocommit mode.
+
+    Raises:
+        pymysql.err.OperationalError: If the database cannot be reached.
+
+    Description:
+        The connection is opened once and kept between alerts. Before it is reused, it is pinged; if the server has
+        closed it, a new connection is opened.
+    """
+    global _DB
+
+    if _DB is not None:
+        try:
+            _DB.ping(reconnect=True)
+            return _DB
+        except pymysql.err.OperationalError:
+            pass
+
+    _DB = pymysql.connect(
+        host=config["db_host"],
+        user=config["db_user"],
+        port=config["db_port"],
+        password=config["db_password"],
+        database=config["db_name"],
+        autocommit=True
+    )
+    return _DB
+
+
 def database_entry(image, timestamp, config):
     """
   Inserts an image and timestamp into a database table for intrusion logging.
 
   Args:
-    image: The image to be stored in the database.
+    image: The JPEG image bytes to be stored in the database.
     timestamp: The timestamp indicating the occurrence of the event.
 
   Returns:
@@ -207,33 +743,20 @@ def database_entry(image, timestamp, config):
   Raises:
     None
 
-  Description: This function establishes a connection to a MySQL database and inserts the provided image and
+  Description: This function uses the shared MySQL connection from get_db() and inserts the provided image and
   timestamp into a specific table.
 
-    The function converts the image to the RGB color space and encodes it as a JPEG image in bytes.
-    It then creates a cursor object to execute the SQL INSERT statement, binding the image and timestamp values to the corresponding placeholders.
-    After executing the SQL statement, the changes are committed to the database.
+    The function stores the already JPEG-encoded image bytes as they are.
+    It creates a cursor object to execute the SQL INSERT statement, binding the image and timestamp values to the corresponding placeholders.
+    The connection is in autocommit mode, so the insert is committed as soon as it is executed.
 
-    Once the insertion is complete, the cursor and database connection are closed.
+    Once the insertion is complete, the cursor is closed and the connection is kept open for the next alert.
 
   """
-    connection = pymysql.connect(
-        host=config["db_host"],
-        user=config["db_user"],
-        port=config["db_port"],
-        password=config["db_password"],
-        database=config["db_name"]
-    )
-    image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    image_bytes = cv2.imencode(".jpg", image)[1].tobytes()
-
-    cursor = connection.cursor()
-    sql = """INSERT INTO intruder_log (image, captured_time) VALUES (%s, %s)"""
-    cursor.execute(sql, (image_bytes, timestamp))
-    connection.commit()
+    connection = get_db(config)
 
-    cursor.close()
-    connection.close()
+    with connection.cursor() as cursor:
+        cursor.execute(_INSERT_SQL, (image, timestamp))
 
 
 if __name__ == "__main__":
@@ -1,9 +1,30 @@
+import locale
+import shutil
+import torch
 from ultralytics import YOLO
 
-def model_train():
+# Let cuDNN benchmark and pick the fastest convolution algorithms for the fixed imgsz=416 input
+torch.backends.cudnn.benchmark = True
+
+# Hyperparameters chosen for the YOLOv8-L model; see model_train()
+TRAIN_HYPERPARAMETERS = {
+    "optimizer": "Adam", "lr0": 0.00001, "lrf": 1, "patience": 5, "weight_decay": 0.0001, "dropout": 0.1,
+    "imgsz": 416, "cache": "disk", "workers": 8, "amp": True, "device": 0,
+}
+
+
+def model_train(data="data.yaml", epochs=30, extra=None, resume=False):
   """
   Trains the YOLOv8-L Model using the specified hyperparameters and dataset.
 
+  Args:
+      data: Path to the dataset yaml file.
+      epochs: The number of epochs to train for.
+      extra: A dictionary of training arguments that are added to, or override, TRAIN_HYPERPARAMETERS and the
+          arguments above.
+      resume: Whether to continue the interrupted run in 'runs/detect/train' from its 'last.pt' checkpoint
+          instead of starting a new one.
+
   Returns:
       None
 
@@ -16,15 +37,55 @@ def model_train():
       ensuring a clean training environment.
 
       The function uses the YOLOv8-L model loaded from the 'yolov8l.pt' file.
-      It trains the model for a specified number of epochs (30 in this case) using the provided dataset file ('data.yaml').
+      It trains the model for the given number of epochs (30 by default) using the provided dataset file ('data.yaml'
+      by default), with the hyperparameters in TRAIN_HYPERPARAMETERS updated by 'extra'.
 
       The training process uses the Adam optimizer with an initial learning rate of 0.00001 and the final learning rate decay factor (lrf) of 1.
+      Preprocessed images are cached on disk rather than in RAM, 8 dataloader workers prepare batches in parallel with the GPU,
+      and mixed precision (AMP) is used on GPU 0. The run always writes to 'runs/detect/train' (exist_ok=True), so the
+      weights end up in the same place on every run.
+
+      With resume=True, the previous run is not cleared; training continues from its last checkpoint with the
+      hyperparameters saved in it.
   """
   locale.getpreferredencoding = lambda: "UTF-8"
-  !rm -rf runs/detect/train
+
+  if resume:
+    model = YOLO("runs/detect/train/weights/last.pt")
+    model.train(resume=True)
+    return
+
+  shutil.rmtree("runs/detect/train", ignore_errors=True)
+
+  # Later keys win, so 'extra' can override any of the other arguments
+  hyperparameters = {**TRAIN_HYPERPARAMETERS, "data": data, "epochs": epochs, "exist_ok": True, **(extra or {})}
 
   model = YOLO("yolov8l.pt")
-  model.train(data="path_to_yaml_file_goes_here",
-            epochs=30, optimizer = 'Adam', lr0=0.00001, lrf=1, augment=True,
-            patience=5, weight_decay=0.0001, dropout=0.1, imgsz=416, cache=True)
-  
\ No newline at end of file
+  model.train(**hyperparameters)
+
+
+def model_export(weights_path="best.pt", int8=False, data=None):
+  """
+  Exports the trained model to a TensorRT engine for live inference.
+
+  Args:
+      weights_path: Path to the trained PyTorch weights ('best.pt').
+      int8: Whether to build an INT8 engine instead of FP16.
+      data: Path to the dataset yaml file used for INT8 calibration.
+
+  Returns:
+      The path of the exported engine file.
+
+  Raises:
+      None
+
+  Description:
+      This function is run once on the deployment machine, since TensorRT engines are specific to the GPU they are built on.
+      It builds an FP16 engine (or INT8 with calibration on the given dataset) at the training image size of 416,
+      with a dynamic batch of up to 4 frames to match the batches sent by main.py.
+
+      Point 'model_weights_path' in config.json at the returned '.engine' file; Ultralytics loads it like a '.pt' file.
+  """
+  model = YOLO(weights_path)
+  return model.export(format="engine", half=not int8, int8=int8, data=data,
+                      imgsz=416, batch=4, dynamic=True)